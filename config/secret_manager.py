@@ -1,118 +1,501 @@
 """
-Secret Manager - Azure Key Vault Implementation
+Secret Manager - Multi-Cloud Secret Management
 Replace .env files with secure secret management
+Supports AWS Secrets Manager, Azure Key Vault, GCP Secret Manager and env fallback
 """
 import os
-from typing import Optional
-from azure.keyvault.secrets import SecretClient
-from azure.identity import DefaultAzureCredential
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from enum import Enum
 from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
-class SecretManager:
-    """Secure secret management using Azure Key Vault"""
-    
-    def __init__(self):
-        self.vault_url = os.getenv(
-            "AZURE_KEY_VAULT_URL",
-            "https://your-keyvault-name.vault.azure.net/"
-        )
-        
+# Sentinel cached for secrets that resolved to nothing, so repeated
+# probes for a missing secret are dict hits instead of provider dispatch
+_MISSING = object()
+
+# Optional provider SDKs resolved once at import; the per-call fetch
+# methods just check for None instead of re-running import machinery
+try:
+    import boto3 as _boto3
+except ImportError:
+    _boto3 = None
+
+try:
+    from azure.keyvault.secrets import SecretClient as _SecretClient
+    from azure.identity import DefaultAzureCredential as _DefaultAzureCredential
+except ImportError:
+    _SecretClient = None
+    _DefaultAzureCredential = None
+
+try:
+    from google.cloud import secretmanager_v1 as _secretmanager_v1
+except ImportError:
+    _secretmanager_v1 = None
+
+# Provider exception taxonomies, resolved once like the SDKs above:
+# _*_ERRORS bound the except clauses so programming errors are not
+# swallowed as provider errors; _TRANSIENT_ERRORS are worth retrying
+_AZURE_ERRORS: tuple = ()
+_GCP_ERRORS: tuple = ()
+_TRANSIENT_ERRORS: tuple = ()
+try:
+    from azure.core.exceptions import (
+        AzureError as _AzureError,
+        HttpResponseError as _HttpResponseError
+    )
+    _AZURE_ERRORS = (_AzureError,)
+    _TRANSIENT_ERRORS += (_HttpResponseError,)
+except ImportError:
+    _HttpResponseError = None
+try:
+    from google.api_core.exceptions import (
+        GoogleAPICallError as _GoogleAPICallError,
+        ResourceExhausted as _ResourceExhausted,
+        ServiceUnavailable as _ServiceUnavailable
+    )
+    _GCP_ERRORS = (_GoogleAPICallError,)
+    _TRANSIENT_ERRORS += (_ServiceUnavailable, _ResourceExhausted)
+except ImportError:
+    pass
+
+def _is_transient(exc: BaseException) -> bool:
+    """Whether a provider error is a retryable 429/5xx-style failure"""
+    if not isinstance(exc, _TRANSIENT_ERRORS):
+        return False
+    if _HttpResponseError is not None and isinstance(exc, _HttpResponseError):
+        status = getattr(exc, "status_code", None)
+        return status == 429 or (status is not None and status >= 500)
+    return True
+
+def _retry_transient(fetch, attempts: int = 3, base_delay: float = 0.1, max_delay: float = 2.0):
+    """Run fetch(), retrying transient provider errors with exponential backoff"""
+    delay = base_delay
+    for attempt in range(1, attempts + 1):
         try:
-            # Use DefaultAzureCredential for automatic auth
-            # (works with managed identity in production)
-            credential = DefaultAzureCredential()
-            self.client = SecretClient(
-                vault_url=self.vault_url,
-                credential=credential
-            )
-            logger.info("Secret Manager initialized successfully")
+            return fetch()
         except Exception as e:
-            logger.error(f"Failed to initialize Secret Manager: {e}")
-            raise
-    
-    @lru_cache(maxsize=50)
+            if attempt == attempts or not _is_transient(e):
+                raise
+            logger.warning("Transient secret fetch error (attempt %s/%s): %s", attempt, attempts, e)
+            time.sleep(delay)
+            delay = min(delay * 2, max_delay)
+
+class SecretProvider(str, Enum):
+    """Supported secret backends"""
+    AWS = "aws"
+    AZURE = "azure"
+    GCP = "gcp"
+    ENV = "env"
+
+class SecretManager:
+    """
+    Secure secret management across cloud providers with env fallback
+
+    Treat this class as a process-wide singleton (enforced by
+    _get_manager()): the provider SDK client is expensive to build
+    (~600ms for the GCP gRPC channel, IMDS/CLI probes for Azure
+    DefaultAzureCredential) and is constructed exactly once, then
+    shared across threads.
+    """
+
+    def __init__(self, provider: Optional[SecretProvider] = None, ttl_seconds: int = 3600,
+                 refresh_margin: int = 300, max_fanout: int = 16, negative_ttl_seconds: int = 60):
+        # Explicit provider skips env detection entirely (and keeps tests
+        # deterministic: SecretManager(provider=SecretProvider.ENV))
+        self.provider = provider or self._detect_provider()
+        self._client = None
+        self._credential = None
+        self._client_lock = threading.Lock()
+        # Concurrency cap for fan-out fetches (Key Vault throttles ~4000 req/10s)
+        self.max_fanout = max_fanout
+        # TTL cache: secret name -> (value or _MISSING, fetched_at)
+        self.ttl_seconds = ttl_seconds
+        self.refresh_margin = min(refresh_margin, ttl_seconds)
+        # Misses are cached too (as _MISSING) with a shorter TTL
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self._negative_hits: Dict[str, int] = {}
+        self._cache: Dict[str, Tuple[Any, float]] = {}
+        self._cache_lock = threading.RLock()
+        # Dedup registry for concurrent cold fetches of the same secret
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+        self._refresher: Optional[threading.Thread] = None
+        logger.info("Secret Manager initialized with provider: %s", self.provider.value)
+
+    def _detect_provider(self) -> SecretProvider:
+        """Detect which secret backend to use from the environment"""
+        if os.getenv("AWS_SECRETS_MANAGER_REGION") or os.getenv("AWS_REGION"):
+            return SecretProvider.AWS
+        if os.getenv("AZURE_KEY_VAULT_URL"):
+            return SecretProvider.AZURE
+        if os.getenv("GCP_PROJECT_ID") or os.getenv("GOOGLE_CLOUD_PROJECT"):
+            return SecretProvider.GCP
+        return SecretProvider.ENV
+
     def get_secret(self, secret_name: str, default: Optional[str] = None) -> str:
         """
-        Retrieve secret from Key Vault with caching
-        
+        Retrieve secret from the configured provider with TTL caching
+
+        Cached values expire after ttl_seconds so rotated secrets are
+        picked up; a background thread refreshes entries before expiry.
+        Provider errors fall back to environment variables.
+
         Args:
-            secret_name: Name of the secret in Key Vault
+            secret_name: Name of the secret
             default: Default value if secret not found
-            
+
         Returns:
-            Secret value as string
+            Secret value as string ("" if missing and no default)
         """
+        with self._cache_lock:
+            entry = self._cache.get(secret_name)
+            if entry is not None:
+                cached, fetched_at = entry
+                ttl = self.negative_ttl_seconds if cached is _MISSING else self.ttl_seconds
+                if time.monotonic() - fetched_at < ttl:
+                    if cached is _MISSING:
+                        self._record_negative_hit(secret_name)
+                        return default if default is not None else ""
+                    return cached
+
+        # Collapse concurrent cold fetches: the first caller does the
+        # network fetch, everyone else waits on its Future
+        with self._inflight_lock:
+            future = self._inflight.get(secret_name)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[secret_name] = future
+
+        if owner:
+            try:
+                value = self._fetch_secret(secret_name)
+                future.set_result(value)
+            except BaseException as e:
+                future.set_exception(e)
+                raise
+            finally:
+                with self._inflight_lock:
+                    self._inflight.pop(secret_name, None)
+        else:
+            value = future.result(timeout=30)
+
+        if value:
+            if owner:
+                self._store(secret_name, value)
+            return value
+        if owner:
+            # Cache the miss (short TTL) so hot probes for an absent
+            # secret don't re-run provider dispatch every call
+            with self._cache_lock:
+                self._cache[secret_name] = (_MISSING, time.monotonic())
+        if default is not None:
+            logger.info("Using default value for %s", secret_name)
+            return default
+        return ""
+
+    def get_secrets(self, names: List[str]) -> Dict[str, str]:
+        """
+        Retrieve many secrets in one batched round trip
+
+        On AWS this uses BatchGetSecretValue (one RPC for all names); on
+        Azure/GCP the per-secret calls are fanned out across a bounded
+        thread pool. Missing secrets map to "" rather than raising.
+
+        Args:
+            names: Secret names to fetch
+
+        Returns:
+            Mapping of secret name -> value ("" for misses)
+        """
+        results: Dict[str, str] = {}
+        missing: List[str] = []
+        with self._cache_lock:
+            for name in names:
+                entry = self._cache.get(name)
+                if entry is None:
+                    missing.append(name)
+                    continue
+                cached, fetched_at = entry
+                ttl = self.negative_ttl_seconds if cached is _MISSING else self.ttl_seconds
+                if time.monotonic() - fetched_at < ttl:
+                    if cached is _MISSING:
+                        self._record_negative_hit(name)
+                        results[name] = ""
+                    else:
+                        results[name] = cached
+                else:
+                    missing.append(name)
+        if not missing:
+            return results
+
+        if self.provider == SecretProvider.AWS:
+            results.update(self._batch_get_aws_secrets(missing))
+        elif self.provider == SecretProvider.ENV:
+            for name in missing:
+                results[name] = self.get_secret(name)
+        else:
+            # Azure/GCP have no batch RPC; fan out with a bounded pool
+            with ThreadPoolExecutor(max_workers=min(self.max_fanout, len(missing))) as pool:
+                futures = {pool.submit(self.get_secret, name): name for name in missing}
+                for future in as_completed(futures):
+                    name = futures[future]
+                    try:
+                        results[name] = future.result()
+                    except Exception as e:
+                        logger.error("Failed to fetch secret '%s': %s", name, e)
+                        results[name] = ""
+        return results
+
+    def _fetch_secret(self, secret_name: str) -> str:
+        """Dispatch a single fetch to the configured provider"""
+        if self.provider == SecretProvider.AWS:
+            return self._get_aws_secret(secret_name)
+        if self.provider == SecretProvider.AZURE:
+            return self._get_azure_secret(secret_name)
+        if self.provider == SecretProvider.GCP:
+            return self._get_gcp_secret(secret_name)
+        return self._get_env_secret(secret_name)
+
+    def _get_client(self):
+        """Build the provider SDK client once per process (double-checked locking)"""
+        client = self._client
+        if client is not None:
+            return client
+        with self._client_lock:
+            if self._client is None:
+                if self.provider == SecretProvider.AWS:
+                    region = os.getenv("AWS_SECRETS_MANAGER_REGION", os.getenv("AWS_REGION", "us-east-1"))
+                    self._client = _boto3.client("secretsmanager", region_name=region)
+                elif self.provider == SecretProvider.AZURE:
+                    if self._credential is None:
+                        # DefaultAzureCredential probes IMDS/CLI on construction; build once
+                        self._credential = _DefaultAzureCredential()
+                    vault_url = os.getenv("AZURE_KEY_VAULT_URL", "https://your-keyvault-name.vault.azure.net/")
+                    self._client = _SecretClient(vault_url=vault_url, credential=self._credential)
+                elif self.provider == SecretProvider.GCP:
+                    self._client = _secretmanager_v1.SecretManagerServiceClient()
+            return self._client
+
+    def _get_env_secret(self, secret_name: str) -> str:
+        """Fallback: read secret from environment variables"""
+        return os.getenv(secret_name, "")
+
+    def _get_aws_secret(self, secret_name: str) -> str:
+        """Fetch a secret from AWS Secrets Manager"""
+        if _boto3 is None:
+            logger.warning("boto3 not installed, falling back to environment")
+            return self._get_env_secret(secret_name)
         try:
-            secret = self.client.get_secret(secret_name)
-            logger.info(f"Successfully retrieved secret: {secret_name}")
-            return secret.value
+            response = self._get_client().get_secret_value(SecretId=secret_name)
+            logger.info("✅ Retrieved secret '%s' from AWS Secrets Manager", secret_name)
+            return response.get("SecretString", "")
         except Exception as e:
-            logger.warning(f"Failed to get secret {secret_name}: {e}")
-            if default is not None:
-                logger.info(f"Using default value for {secret_name}")
-                return default
-            raise
-    
+            logger.error("AWS Secrets Manager error for '%s': %s", secret_name, e)
+            return self._get_env_secret(secret_name)
+
+    def _batch_get_aws_secrets(self, names: List[str]) -> Dict[str, str]:
+        """Fetch many secrets from AWS in a single BatchGetSecretValue call"""
+        if _boto3 is None:
+            logger.warning("boto3 not installed, falling back to environment")
+            return {name: self._get_env_secret(name) for name in names}
+        try:
+            results: Dict[str, str] = {name: "" for name in names}
+            response = self._get_client().batch_get_secret_value(SecretIdList=names)
+            for secret in response.get("SecretValues", []):
+                value = secret.get("SecretString", "")
+                results[secret["Name"]] = value
+                if value:
+                    self._store(secret["Name"], value)
+            for error in response.get("Errors", []):
+                logger.error("AWS batch fetch error for '%s': %s", error.get("SecretId"), error.get("Message"))
+            return results
+        except Exception as e:
+            logger.error("AWS BatchGetSecretValue error: %s", e)
+            return {name: self._get_env_secret(name) for name in names}
+
+    def _get_azure_secret(self, secret_name: str) -> str:
+        """Fetch a secret from Azure Key Vault"""
+        if _SecretClient is None:
+            logger.warning("azure-keyvault-secrets not installed, falling back to environment")
+            return self._get_env_secret(secret_name)
+        try:
+            secret = _retry_transient(lambda: self._get_client().get_secret(secret_name))
+            logger.info("✅ Retrieved secret '%s' from Azure Key Vault", secret_name)
+            return secret.value or ""
+        except _AZURE_ERRORS as e:
+            logger.error("Azure Key Vault error for '%s': %s", secret_name, e)
+            return self._get_env_secret(secret_name)
+
+    def _get_gcp_secret(self, secret_name: str) -> str:
+        """Fetch a secret from GCP Secret Manager"""
+        if _secretmanager_v1 is None:
+            logger.warning("google-cloud-secret-manager not installed, falling back to environment")
+            return self._get_env_secret(secret_name)
+        try:
+            project = os.getenv("GCP_PROJECT_ID", os.getenv("GOOGLE_CLOUD_PROJECT", ""))
+            name = f"projects/{project}/secrets/{secret_name}/versions/latest"
+            response = _retry_transient(
+                lambda: self._get_client().access_secret_version(request={"name": name})
+            )
+            logger.info("✅ Retrieved secret '%s' from GCP Secret Manager", secret_name)
+            return response.payload.data.decode("utf-8")
+        except _GCP_ERRORS as e:
+            logger.error("GCP Secret Manager error for '%s': %s", secret_name, e)
+            return self._get_env_secret(secret_name)
+
     def set_secret(self, secret_name: str, secret_value: str) -> None:
         """
-        Store a secret in Key Vault
-        
+        Store a secret in the configured backend
+
         Args:
             secret_name: Name of the secret
             secret_value: Value to store
         """
-        try:
-            self.client.set_secret(secret_name, secret_value)
-            logger.info(f"Successfully stored secret: {secret_name}")
-            # Clear cache for this secret
-            self.get_secret.cache_clear()
-        except Exception as e:
-            logger.error(f"Failed to set secret {secret_name}: {e}")
-            raise
+        if self.provider == SecretProvider.AWS:
+            if _boto3 is None:
+                raise NotImplementedError("boto3 not installed")
+            self._get_client().put_secret_value(SecretId=secret_name, SecretString=secret_value)
+        elif self.provider == SecretProvider.AZURE:
+            if _SecretClient is None:
+                raise NotImplementedError("azure-keyvault-secrets not installed")
+            self._get_client().set_secret(secret_name, secret_value)
+        elif self.provider == SecretProvider.GCP:
+            if _secretmanager_v1 is None:
+                raise NotImplementedError("google-cloud-secret-manager not installed")
+            project = os.getenv("GCP_PROJECT_ID", os.getenv("GOOGLE_CLOUD_PROJECT", ""))
+            self._get_client().add_secret_version(
+                request={
+                    "parent": f"projects/{project}/secrets/{secret_name}",
+                    "payload": {"data": secret_value.encode("utf-8")}
+                }
+            )
+        else:
+            os.environ[secret_name] = secret_value
+        logger.info("Successfully stored secret: %s", secret_name)
+        self._store(secret_name, secret_value)
 
-# Global instance
-secret_manager = SecretManager()
+    def _record_negative_hit(self, secret_name: str) -> None:
+        """Meter cache hits on missing secrets; a hot miss is usually misconfiguration"""
+        count = self._negative_hits.get(secret_name, 0) + 1
+        self._negative_hits[secret_name] = count
+        if count % 100 == 0:
+            logger.warning("Secret '%s' is missing but has been requested %s times", secret_name, count)
 
-# Convenience function
-def get_secret(name: str, default: Optional[str] = None) -> str:
-    """Get secret from Key Vault"""
-    return secret_manager.get_secret(name, default)
+    def negative_hit_count(self, secret_name: str) -> int:
+        """Number of cache hits served for a missing secret"""
+        return self._negative_hits.get(secret_name, 0)
 
+    def warm(self, names: Optional[List[str]] = None) -> Dict[str, str]:
+        """
+        Prefetch a known set of secrets in one batched call
 
-# ========== AWS SECRETS MANAGER VERSION ==========
-"""
-import boto3
-from botocore.exceptions import ClientError
-import json
-
-class AWSSecretManager:
-    def __init__(self, region_name: str = "us-east-1"):
-        self.client = boto3.client(
-            service_name='secretsmanager',
-            region_name=region_name
-        )
-    
-    @lru_cache(maxsize=50)
-    def get_secret(self, secret_name: str, default: Optional[str] = None) -> str:
-        try:
-            response = self.client.get_secret_value(SecretId=secret_name)
-            
-            # Handle both string and JSON secrets
-            if 'SecretString' in response:
-                secret = response['SecretString']
+        Call during app startup (before traffic) so first-request paths
+        never pay secret-fetch latency; defaults to WARM_SECRETS.
+        """
+        return self.get_secrets(names if names is not None else WARM_SECRETS)
+
+    def invalidate(self, secret_name: str) -> None:
+        """Drop a single secret from the cache (next read refetches)"""
+        with self._cache_lock:
+            self._cache.pop(secret_name, None)
+
+    def clear(self) -> None:
+        """Drop all cached secrets"""
+        with self._cache_lock:
+            self._cache.clear()
+
+    def _store(self, secret_name: str, value: str) -> None:
+        """Cache a secret value and make sure the refresher is running"""
+        with self._cache_lock:
+            self._cache[secret_name] = (value, time.monotonic())
+        self._ensure_refresher()
+
+    def _ensure_refresher(self) -> None:
+        """Start the background refresh thread on first cached secret"""
+        if self._refresher is not None and self._refresher.is_alive():
+            return
+        with self._cache_lock:
+            if self._refresher is not None and self._refresher.is_alive():
+                return
+            self._refresher = threading.Thread(
+                target=self._refresh_loop,
+                name="secret-manager-refresh",
+                daemon=True
+            )
+            self._refresher.start()
+
+    def _refresh_loop(self) -> None:
+        """Re-fetch cached secrets shortly before they expire"""
+        interval = max(self.ttl_seconds - self.refresh_margin, 1)
+        while True:
+            time.sleep(interval)
+            with self._cache_lock:
+                names = list(self._cache.keys())
+            for name in names:
+                with self._cache_lock:
+                    entry = self._cache.get(name)
+                if entry is None or entry[0] is _MISSING:
+                    continue
+                age = time.monotonic() - entry[1]
+                if age < self.ttl_seconds - self.refresh_margin:
+                    continue
                 try:
-                    return json.loads(secret)
-                except json.JSONDecodeError:
-                    return secret
-            else:
-                return base64.b64decode(response['SecretBinary'])
-                
-        except ClientError as e:
-            logger.warning(f"Failed to get secret {secret_name}: {e}")
-            if default is not None:
-                return default
-            raise
-"""
+                    value = self._fetch_secret(name)
+                    if value:
+                        with self._cache_lock:
+                            self._cache[name] = (value, time.monotonic())
+                except Exception as e:
+                    # Keep serving the stale value; next get_secret retries
+                    logger.warning("Background refresh failed for %s: %s", name, e)
+
+# Secrets every deployment needs at startup; warmed in one batched call
+WARM_SECRETS: List[str] = [
+    "API_KEY",
+    "JWT_SECRET_KEY",
+    "SUPABASE_URL",
+    "SUPABASE_KEY",
+    "YOTTA_API_KEY",
+    "BHIV_BUCKET_ACCESS_KEY",
+    "BHIV_BUCKET_SECRET_KEY",
+    "DATABASE_URL",
+]
+
+# Lazy process-wide singleton: built on first use so importing this
+# module costs nothing for code that never fetches a secret
+@lru_cache(maxsize=1)
+def _get_manager() -> SecretManager:
+    # SECRET_PROVIDER pins the backend explicitly (aws/azure/gcp/env);
+    # otherwise fall back to multi-cloud env-var detection
+    override = os.getenv("SECRET_PROVIDER")
+    provider = SecretProvider(override.lower()) if override else None
+    return SecretManager(provider=provider)
+
+# Convenience functions
+def get_secret(name: str, default: Optional[str] = None) -> str:
+    """Get secret from the configured provider"""
+    return _get_manager().get_secret(name, default)
+
+def get_secrets(names: List[str]) -> Dict[str, str]:
+    """Get many secrets in one batched call"""
+    return _get_manager().get_secrets(names)
+
+def warm_secrets(names: Optional[List[str]] = None) -> Dict[str, str]:
+    """Prefetch startup secrets (WARM_SECRETS by default) in one batched call"""
+    return _get_manager().warm(names)
+
+def get_provider() -> SecretProvider:
+    """Return the detected secret backend"""
+    return _get_manager().provider
+
+def __getattr__(name: str):
+    # Backward-compat: `secret_manager` used to be an eager module-level
+    # instance; resolve it lazily through the singleton accessor
+    if name == "secret_manager":
+        return _get_manager()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
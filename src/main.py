@@ -111,8 +111,10 @@ try:
     config_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'config')
     if config_path not in sys.path:
         sys.path.insert(0, config_path)
-    from config.secret_manager import get_secret
-    
+    from config.secret_manager import get_secret, warm_secrets
+
+    # One batched fetch primes the cache; the lookups below are cache hits
+    warm_secrets()
     API_KEY = get_secret("API_KEY")
     JWT_SECRET = get_secret("JWT_SECRET_KEY")
     SUPABASE_URL = get_secret("SUPABASE_URL")
@@ -0,0 +1,86 @@
+"""
+msgspec mirrors of the per-object ID schema for bulk ingestion
+
+The Pydantic models in object_schema stay the public API; these
+msgspec.Struct twins exist for the hottest streaming/bulk decode paths,
+where a JIT-specialized msgspec decoder is typically 2-5x faster than
+pydantic-core and skips Python object construction for primitive
+fields. Convert to Pydantic via to_pydantic() only when edit
+operations follow.
+"""
+
+import time
+from typing import Any, Dict, List, Optional
+
+import msgspec
+
+from .object_schema import SpecSchema
+
+class PositionMS(msgspec.Struct, frozen=True):
+    """3D position coordinates"""
+    x: float = 0.0
+    y: float = 0.0
+    z: float = 0.0
+
+class RotationMS(msgspec.Struct, frozen=True):
+    """Rotation angles in degrees"""
+    x: float = 0.0
+    y: float = 0.0
+    z: float = 0.0
+
+class DimensionsMS(msgspec.Struct, frozen=True):
+    """Object dimensions"""
+    length: float
+    width: float
+    height: float
+    units: str = "meters"
+
+class MaterialPropertiesMS(msgspec.Struct, frozen=True):
+    """Editable material properties (material type kept free-form here;
+    the Pydantic conversion applies the enum fallback)"""
+    type: str
+    raw_type: Optional[str] = None
+    color: Optional[str] = None
+    texture: Optional[str] = None
+    finish: Optional[str] = None
+    reflectivity: Optional[float] = None
+    roughness: Optional[float] = None
+    metallic: Optional[float] = None
+    properties: Dict[str, Any] = msgspec.field(default_factory=dict)
+    editable: bool = True
+
+class DesignObjectMS(msgspec.Struct, frozen=True):
+    """Individual design object with unique ID"""
+    object_id: str
+    object_type: str
+    material: MaterialPropertiesMS
+    dimensions: DimensionsMS
+    raw_type: Optional[str] = None
+    position: PositionMS = PositionMS()
+    rotation: Optional[RotationMS] = None
+    metadata: Dict[str, Any] = msgspec.field(default_factory=dict)
+    editable: bool = True
+
+class SpecSchemaMS(msgspec.Struct, frozen=True):
+    """Complete specification with per-object IDs"""
+    spec_id: str
+    objects: List[DesignObjectMS]
+    scene_metadata: Dict[str, Any] = msgspec.field(default_factory=dict)
+    created_at_ns: int = msgspec.field(default_factory=time.time_ns)
+    updated_at_ns: int = msgspec.field(default_factory=time.time_ns)
+
+# Decoder specialized for SpecSchemaMS, built once at import
+_SPEC_DECODER = msgspec.json.Decoder(SpecSchemaMS)
+_SPEC_ENCODER = msgspec.json.Encoder()
+
+def decode_spec(raw: bytes) -> SpecSchemaMS:
+    """Decode a spec JSON payload straight into msgspec structs"""
+    return _SPEC_DECODER.decode(raw)
+
+def encode_spec(spec: SpecSchemaMS) -> bytes:
+    """Encode a msgspec spec back to JSON bytes"""
+    return _SPEC_ENCODER.encode(spec)
+
+def to_pydantic(spec: SpecSchemaMS) -> SpecSchema:
+    """Convert a bulk-ingested spec to the public Pydantic model"""
+    return SpecSchema.model_validate(msgspec.to_builtins(spec))
@@ -3,29 +3,158 @@ Per-Object ID Schema (Day 1 Requirement)
 Spec schema with per-object IDs and editable material properties
 """
 
-from pydantic import BaseModel, Field
-from typing import Dict, Any, List, Optional
-from datetime import datetime
+import re
+import time
+from dataclasses import dataclass, field
+from enum import Enum
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, field_validator, model_validator
+from typing import Annotated, ClassVar, Dict, Any, List, Optional
+from datetime import datetime, timezone
+
+import numpy as np
+import orjson
+
+# Fraction in [0, 1]; validated in pydantic-core without a Python callback
+UnitInterval = Annotated[float, Field(ge=0.0, le=1.0)]
+
+# {type}_{number} naming convention, compiled once and reused across validations
+_ID_RE = re.compile(r"^[a-z][a-z0-9]*_\d+$")
+
+# Module-level constant so the example literal is built once at import,
+# not re-evaluated per schema render (kept a plain dict: pydantic's
+# schema generation deepcopies json_schema_extra, which a mappingproxy
+# would break)
+_SPEC_SCHEMA_EXAMPLE: Dict[str, Any] = {
+    "example": {
+        "spec_id": "spec_12345",
+        "objects": [
+            {
+                "object_id": "floor_1",
+                "object_type": "floor",
+                "material": {
+                    "type": "wood",
+                    "color": "#8B4513",
+                    "texture": "smooth",
+                    "finish": "glossy",
+                    "properties": {"hardness": "medium"},
+                    "editable": True
+                },
+                "position": {"x": 0, "y": 0, "z": 0},
+                "dimensions": {"length": 10, "width": 10, "height": 0.1, "units": "meters"},
+                "editable": True
+            },
+            {
+                "object_id": "sofa_1",
+                "object_type": "furniture",
+                "material": {
+                    "type": "fabric",
+                    "color": "#4A4A4A",
+                    "texture": "soft",
+                    "finish": "matte",
+                    "properties": {"comfort": "high"},
+                    "editable": True
+                },
+                "position": {"x": 2, "y": 0, "z": 3},
+                "dimensions": {"length": 2, "width": 0.9, "height": 0.8, "units": "meters"},
+                "editable": True
+            }
+        ],
+        "scene_metadata": {
+            "environment": "living_room",
+            "lighting": "natural",
+            "style": "modern"
+        }
+    }
+}
+
+# Categorical types as str-enums: in a 10k-object scene each value is a
+# singleton member instead of a fresh str, and equality is a pointer
+# compare. Unknown values fall back to OTHER with the original string
+# preserved in raw_type. (StrEnum needs 3.11+; (str, Enum) matches the
+# py38 floor and validates identically under pydantic.)
+class ObjectType(str, Enum):
+    FLOOR = "floor"
+    WALL = "wall"
+    CEILING = "ceiling"
+    DOOR = "door"
+    WINDOW = "window"
+    FURNITURE = "furniture"
+    LIGHTING = "lighting"
+    DECOR = "decor"
+    OTHER = "other"
+
+class MaterialType(str, Enum):
+    WOOD = "wood"
+    METAL = "metal"
+    FABRIC = "fabric"
+    CONCRETE = "concrete"
+    GLASS = "glass"
+    PLASTIC = "plastic"
+    STONE = "stone"
+    LEATHER = "leather"
+    OTHER = "other"
+
+class MaterialExtras(BaseModel):
+    """
+    Typed view of the common ad-hoc material properties
+
+    Known keys validate as plain fields in pydantic-core instead of the
+    generic Dict[str, Any] branch; unknown keys are still accepted via
+    extra="allow" for forward compatibility.
+    """
+    model_config = ConfigDict(extra="allow")
+    hardness: Optional[str] = Field(None, description="Material hardness (e.g., soft, medium, hard)")
+    comfort: Optional[str] = Field(None, description="Comfort level (e.g., low, medium, high)")
+
+class SceneMetadata(BaseModel):
+    """Typed view of common scene-level metadata (extra keys allowed)"""
+    model_config = ConfigDict(extra="allow")
+    environment: Optional[str] = Field(None, description="Scene environment (e.g., living_room, office)")
+    lighting: Optional[str] = Field(None, description="Lighting style (e.g., natural, ambient)")
+    style: Optional[str] = Field(None, description="Design style (e.g., modern, rustic)")
 
 class MaterialProperties(BaseModel):
     """Editable material properties for each object (Day 1 Requirement)"""
-    type: str = Field(..., description="Material type (e.g., wood, metal, fabric, concrete, glass)")
+    type: MaterialType = Field(..., description="Material type (e.g., wood, metal, fabric, concrete, glass)")
+    raw_type: Optional[str] = Field(None, description="Original material type when type falls back to 'other'")
     color: Optional[str] = Field(None, description="Material color (hex code or name)")
     texture: Optional[str] = Field(None, description="Texture type (smooth, rough, glossy, matte)")
     finish: Optional[str] = Field(None, description="Surface finish (matte, glossy, satin, brushed)")
-    reflectivity: Optional[float] = Field(None, ge=0.0, le=1.0, description="Reflectivity (0.0-1.0)")
-    roughness: Optional[float] = Field(None, ge=0.0, le=1.0, description="Surface roughness (0.0-1.0)")
-    metallic: Optional[float] = Field(None, ge=0.0, le=1.0, description="Metallic property (0.0-1.0)")
-    properties: Dict[str, Any] = Field(default_factory=dict, description="Additional material properties")
+    reflectivity: Optional[UnitInterval] = Field(None, description="Reflectivity (0.0-1.0)")
+    roughness: Optional[UnitInterval] = Field(None, description="Surface roughness (0.0-1.0)")
+    metallic: Optional[UnitInterval] = Field(None, description="Metallic property (0.0-1.0)")
+    properties: MaterialExtras = Field(default_factory=MaterialExtras, description="Additional material properties")
     editable: bool = Field(True, description="Whether material can be edited via switch API")
 
-class Position(BaseModel):
+    @model_validator(mode="before")
+    @classmethod
+    def _fallback_unknown_type(cls, data):
+        if isinstance(data, dict):
+            raw = data.get("type")
+            if isinstance(raw, str) and raw not in MaterialType._value2member_map_:
+                data = {**data, "type": MaterialType.OTHER, "raw_type": raw}
+        return data
+
+# Pure-value types: slotted dataclasses instead of BaseModel so scenes
+# with thousands of objects avoid a per-instance __dict__ (~3x smaller,
+# C-slot attribute access). Pydantic still validates/coerces dicts into
+# them when they appear as DesignObject fields.
+@dataclass(slots=True)
+class Position:
     """3D position coordinates"""
     x: float = 0.0
     y: float = 0.0
     z: float = 0.0
 
-class Dimensions(BaseModel):
+@dataclass(slots=True)
+class Rotation:
+    """Rotation angles in degrees"""
+    x: float = 0.0
+    y: float = 0.0
+    z: float = 0.0
+
+@dataclass(slots=True)
+class Dimensions:
     """Object dimensions"""
     length: float
     width: float
@@ -35,67 +164,133 @@ class Dimensions(BaseModel):
 class DesignObject(BaseModel):
     """Individual design object with unique ID (Day 1 Requirement)"""
     object_id: str = Field(..., description="Unique object ID following pattern: {type}_{number} (e.g., floor_1, sofa_1, chair_2)")
-    object_type: str = Field(..., description="Type of object (floor, wall, ceiling, door, window, furniture, etc.)")
+    object_type: ObjectType = Field(..., description="Type of object (floor, wall, ceiling, door, window, furniture, etc.)")
+    raw_type: Optional[str] = Field(None, description="Original object type when object_type falls back to 'other'")
     material: MaterialProperties = Field(..., description="Editable material properties")
     position: Position = Field(default_factory=Position, description="3D position in scene")
     dimensions: Dimensions = Field(..., description="Object dimensions")
-    rotation: Optional[Dict[str, float]] = Field(None, description="Rotation angles in degrees (x, y, z)")
+    rotation: Optional[Rotation] = Field(None, description="Rotation angles in degrees (x, y, z)")
     metadata: Dict[str, Any] = Field(default_factory=dict, description="Additional object metadata")
     editable: bool = Field(True, description="Whether object properties can be modified")
-    
+
+    @model_validator(mode="before")
+    @classmethod
+    def _fallback_unknown_type(cls, data):
+        if isinstance(data, dict):
+            raw = data.get("object_type")
+            if isinstance(raw, str) and raw not in ObjectType._value2member_map_:
+                data = {**data, "object_type": ObjectType.OTHER, "raw_type": raw}
+        return data
+
+    @field_validator("object_id")
+    @classmethod
+    def _validate_object_id(cls, v: str) -> str:
+        if not _ID_RE.match(v):
+            raise ValueError(f"object_id must follow pattern {{type}}_{{number}} (e.g. floor_1), got: {v}")
+        return v
+
     @staticmethod
     def generate_id(object_type: str, index: int) -> str:
         """Generate object ID following naming convention: {type}_{number}"""
-        return f"{object_type.lower()}_{index}"
+        return object_type.lower() + "_" + str(index)
+
+@dataclass(slots=True)
+class SceneArrays:
+    """
+    Structure-of-arrays view over SpecSchema.objects
+
+    Bulk numeric passes (bounding boxes, collision, export) iterate
+    contiguous NumPy columns instead of chasing per-object Python
+    attributes, so a 10k-object scene is one vectorized pass.
+    """
+    object_ids: List[str] = field(default_factory=list)
+    object_type_codes: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int16))
+    type_table: List[str] = field(default_factory=list)  # code -> object_type
+    positions_xyz: np.ndarray = field(default_factory=lambda: np.empty((0, 3), dtype=np.float32))
+    dimensions_lwh: np.ndarray = field(default_factory=lambda: np.empty((0, 3), dtype=np.float32))
 
 class SpecSchema(BaseModel):
     """Complete specification with per-object IDs"""
     spec_id: str = Field(..., description="Unique specification ID")
     objects: List[DesignObject] = Field(..., description="List of design objects with unique IDs")
-    scene_metadata: Dict[str, Any] = Field(default_factory=dict, description="Scene-level metadata")
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
-    
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "spec_id": "spec_12345",
-                "objects": [
-                    {
-                        "object_id": "floor_1",
-                        "object_type": "floor",
-                        "material": {
-                            "type": "wood",
-                            "color": "#8B4513",
-                            "texture": "smooth",
-                            "finish": "glossy",
-                            "properties": {"hardness": "medium"},
-                            "editable": True
-                        },
-                        "position": {"x": 0, "y": 0, "z": 0},
-                        "dimensions": {"length": 10, "width": 10, "height": 0.1, "units": "meters"},
-                        "editable": True
-                    },
-                    {
-                        "object_id": "sofa_1",
-                        "object_type": "furniture",
-                        "material": {
-                            "type": "fabric",
-                            "color": "#4A4A4A",
-                            "texture": "soft",
-                            "finish": "matte",
-                            "properties": {"comfort": "high"},
-                            "editable": True
-                        },
-                        "position": {"x": 2, "y": 0, "z": 3},
-                        "dimensions": {"length": 2, "width": 0.9, "height": 0.8, "units": "meters"},
-                        "editable": True
-                    }
-                ],
-                "scene_metadata": {
-                    "environment": "living_room",
-                    "lighting": "natural",
-                    "style": "modern"
-                }
-            }
-        }
+    scene_metadata: SceneMetadata = Field(default_factory=SceneMetadata, description="Scene-level metadata")
+    # Epoch nanoseconds instead of datetime: time.time_ns() is a single
+    # syscall returning an int (datetime.utcnow is deprecated and allocates
+    # a datetime per spec); serialized payloads carry the raw integers
+    created_at_ns: int = Field(default_factory=time.time_ns, description="Creation time (epoch ns)")
+    updated_at_ns: int = Field(default_factory=time.time_ns, description="Last update time (epoch ns)")
+
+    @property
+    def created_at(self) -> datetime:
+        """Creation time as an aware UTC datetime (built on demand)"""
+        return datetime.fromtimestamp(self.created_at_ns / 1e9, tz=timezone.utc)
+
+    @property
+    def updated_at(self) -> datetime:
+        """Last update time as an aware UTC datetime (built on demand)"""
+        return datetime.fromtimestamp(self.updated_at_ns / 1e9, tz=timezone.utc)
+
+    # Lazily built SoA view; `objects` stays the authoritative edit structure
+    _soa: Optional[SceneArrays] = PrivateAttr(default=None)
+
+    def to_soa(self, refresh: bool = False) -> SceneArrays:
+        """
+        Return a structure-of-arrays view of the objects list
+
+        The view is cached; pass refresh=True (or call invalidate_soa())
+        after mutating `objects` to rebuild it.
+        """
+        if self._soa is None or refresh:
+            n = len(self.objects)
+            positions = np.empty((n, 3), dtype=np.float32)
+            dimensions = np.empty((n, 3), dtype=np.float32)
+            codes = np.empty(n, dtype=np.int16)
+            type_codes: Dict[str, int] = {}
+            object_ids: List[str] = []
+            for i, obj in enumerate(self.objects):
+                object_ids.append(obj.object_id)
+                codes[i] = type_codes.setdefault(obj.object_type, len(type_codes))
+                positions[i] = (obj.position.x, obj.position.y, obj.position.z)
+                dimensions[i] = (obj.dimensions.length, obj.dimensions.width, obj.dimensions.height)
+            self._soa = SceneArrays(
+                object_ids=object_ids,
+                object_type_codes=codes,
+                type_table=list(type_codes),
+                positions_xyz=positions,
+                dimensions_lwh=dimensions
+            )
+        return self._soa
+
+    def invalidate_soa(self) -> None:
+        """Mark the SoA view stale after editing `objects`"""
+        self._soa = None
+
+    def to_json_bytes(self) -> bytes:
+        """Serialize to JSON bytes via orjson (3-10x faster than stdlib json)"""
+        return orjson.dumps(self.model_dump(mode="json"), option=orjson.OPT_NON_STR_KEYS)
+
+    @classmethod
+    def from_json_bytes(cls, raw: bytes) -> "SpecSchema":
+        """Parse and validate a spec from JSON bytes via orjson"""
+        return cls.model_validate(orjson.loads(raw))
+
+    # Pydantic v2 config: parse/validate with SpecSchema.model_validate_json(raw)
+    # at API boundaries so JSON decoding happens inside pydantic-core
+    model_config = ConfigDict(json_schema_extra=_SPEC_SCHEMA_EXAMPLE)
+
+    # Frozen JSON schema, generated once; FastAPI regenerates OpenAPI per
+    # request by default, and the base implementation re-merges
+    # json_schema_extra on every call
+    _cached_schema: ClassVar[Optional[Dict[str, Any]]] = None
+
+    @classmethod
+    def model_json_schema(cls, *args, **kwargs):
+        if cls is SpecSchema and not args and not kwargs:
+            if cls._cached_schema is None:
+                cls._cached_schema = super().model_json_schema()
+            return cls._cached_schema
+        return super().model_json_schema(*args, **kwargs)
+
+
+# Warm the schema cache at import so the first OpenAPI render is free
+SpecSchema.model_json_schema()